@@ -8,7 +8,7 @@ from ps2controller import PS2Controller
 
 # one way to wire this up, for example on a Pico
 ps2 = PS2Controller(dat=board.GP2, cmd=board.GP3, att=board.GP4, clk=board.GP5,
-                    enable_pressure=True)
+                    enable_pressure=True, measure_dt=True, min_period_ms=0)
 
 print("be prepared to be spammed, this is raw data from the controller")
 while True:
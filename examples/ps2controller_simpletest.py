@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: Unlicense
 
+import time
 import board
 from ps2controller import PS2Controller
 
@@ -9,7 +10,14 @@ from ps2controller import PS2Controller
 ps2 = PS2Controller(dat=board.GP2, cmd=board.GP3, att=board.GP4, clk=board.GP5)
 
 print("hi press buttons")
+# controllers only update ~60 times a second, so don't poll faster than that
+POLL_PERIOD_NS = 16_000_000
+next_poll_ns = time.monotonic_ns()
 while True:
+    now_ns = time.monotonic_ns()
+    if now_ns < next_poll_ns:
+        continue  # other work could go here
+    next_poll_ns = now_ns + POLL_PERIOD_NS
     events = ps2.update()
     if events:
         print("events", events)
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+import time
 import board
 import usb_hid
 from adafruit_hid.keyboard import Keyboard
@@ -25,14 +26,21 @@ keyboard = Keyboard(usb_hid.devices)
 ps2 = PS2Controller(dat=board.GP2, cmd=board.GP3, att=board.GP4, clk=board.GP5)
 
 print("hi, press buttons")
+# controllers only update ~60 times a second, so don't poll faster than that
+POLL_PERIOD_NS = 16_000_000
+next_poll_ns = time.monotonic_ns()
 while True:
+    now_ns = time.monotonic_ns()
+    if now_ns < next_poll_ns:
+        continue  # other work could go here
+    next_poll_ns = now_ns + POLL_PERIOD_NS
     events = ps2.update()
     if events:
         print("events", events)
-        for event in events:
+        for _, pressed, released, name in events:
             # find keys to send for button, undefined buttons send SPACE
-            keycodes = buttons_to_keys.get(event.name, (Keycode.SPACE,))
-            if event.pressed:
+            keycodes = buttons_to_keys.get(name, (Keycode.SPACE,))
+            if pressed:
                 keyboard.press(*keycodes)
-            elif event.released:
+            elif released:
                 keyboard.release(*keycodes)
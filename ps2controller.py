@@ -27,6 +27,7 @@ Implementation Notes
 """
 
 from collections import namedtuple
+import struct
 import time
 from micropython import const
 import digitalio
@@ -35,29 +36,54 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/todbot/CircuitPython_PS2Controller.git"
 
 
-# Time between att being issues to control and first clock edge
+# Time between att being asserted to controller and first clock edge
 _ATTN_DELAY_MICROS = const(40)
-# hold time for dat/cmd pins after clk
-_HOLD_TIME_MICROS = const(2)
-# Delay between bytes sent
-_BYTE_DELAY_MICROS = const(2)
 # Commands are sent to the controller repeatedly, until they succeed or time out
 _COMMAND_TIMEOUT_SECS = 0.25
-# Delay to wait after switching controllerl mode
-_MODE_SWITCH_DELAY_SECS = 0.50
+# Time to sleep between reads in poll_until_change()
+_POLL_SLEEP_SECS = 0.005
+
+# Bit rate of the clock when shifting with PIO, PS2 controllers are good to ~500kHz
+_PIO_BIT_RATE = const(250_000)
+
+# PS2 is SPI mode 3, LSB first: clk idles high, cmd changes on falling edge,
+# dat sampled on rising edge. 4 PIO cycles per bit. cmd is "out", dat is "in",
+# clk is side-set.
+_PIO_PROGRAM = """
+.program ps2
+.side_set 1
+    out x, 1     side 1      ; stall here with clk idle high until a byte is sent
+    mov pins, x  side 0 [1]  ; put cmd bit out, clk low
+    in pins, 1   side 1      ; sample dat bit, clk high
+"""
+
+# Longest reply a controller can report: 3 header bytes + 15 16-bit words
+_MAX_REPLY_LEN = const(3 + 0x0F * 2)
+
+# Replies in config mode (0xF3) are always 3 header bytes + 3 words
+_CONFIG_REPLY_LEN = const(9)
+
+# Clock rate for hardware SPI, same ~250kHz as the PIO path
+_SPI_BAUDRATE = const(250_000)
+
+# Bit masks for shifting a byte out/in, LSB first
+_BITS = (0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80)
 
 # fmt: off
 # Command to enter the controller configuration (also known as \a escape) mode
-_enter_config  = (0x01, 0x43, 0x00, 0x01, 0x5A)
-_exit_config   = (0x01, 0x43, 0x00, 0x00, 0x5A)
-_type_read     = (0x01, 0x45, 0x00)
-_set_mode      = (0x01, 0x44, 0x00, 0x01, 0x03, 0x00, 0x00, 0x00, 0x00)
-_enable_rumble = (0x01, 0x4D, 0x00, 0x00, 0x01)
-_set_pressures = (0x01, 0x4F, 0x00, 0xFF, 0xFF, 0x03, 0x00, 0x00, 0x00)
+_enter_config  = bytes((0x01, 0x43, 0x00, 0x01, 0x5A))
+_exit_config   = bytes((0x01, 0x43, 0x00, 0x00, 0x5A))
+_type_read     = bytes((0x01, 0x45, 0x00))
+# Mode commands, bytes from 3 on are replaced by the settings sent
+_set_mode      = bytes((0x01, 0x44, 0x00, 0x01, 0x03, 0x00, 0x00, 0x00, 0x00))
+_enable_rumble = bytes((0x01, 0x4D, 0x00, 0x00, 0x01))
+_set_pressures = bytes((0x01, 0x4F, 0x00, 0xFF, 0xFF, 0x03, 0x00, 0x00, 0x00))
 # Command to read status of all buttons, 3 & 4 are rumble vals
-_poll_rumble   = (0x01, 0x42, 0x00, 0xFF, 0xFF)
+_poll_rumble   = bytes((0x01, 0x42, 0x00, 0xFF, 0xFF))
 # Command to read status of all buttons.
-_poll          = (0x01, 0x42, 0x00)
+_poll          = bytes((0x01, 0x42, 0x00))
+# Padding sent out while reading the rest of a reply
+_pad           = bytes((0x5A,)) * _MAX_REPLY_LEN
 # fmt: on
 
 
@@ -75,8 +101,12 @@ def _get_reply_length(status):
 
 
 def _delay_micros(usec):
-    """Sleep the given number of microseconds, likely not accurate"""
-    time.sleep(usec / 1_000_000)
+    """Busy-wait the given number of microseconds.
+    time.sleep() only has millisecond resolution, so spin on monotonic_ns() instead
+    """
+    end_t = time.monotonic_ns() + usec * 1000
+    while time.monotonic_ns() < end_t:
+        pass
 
 
 def _hexify(buf):
@@ -86,8 +116,73 @@ def _hexify(buf):
     return " ".join("%02x" % v for v in buf)
 
 
+def _make_state_machine(clk, cmd, dat):
+    """Create the RP2040 PIO state machine that shifts bytes in and out"""
+    import rp2pio  # pylint: disable=import-outside-toplevel
+    import adafruit_pioasm  # pylint: disable=import-outside-toplevel
+
+    return rp2pio.StateMachine(
+        adafruit_pioasm.assemble(_PIO_PROGRAM),
+        frequency=_PIO_BIT_RATE * 4,
+        first_out_pin=cmd,
+        initial_out_pin_state=1,
+        initial_out_pin_direction=1,
+        first_in_pin=dat,
+        pull_in_pin_up=1,
+        first_sideset_pin=clk,
+        initial_sideset_pin_state=1,
+        auto_pull=True,
+        pull_threshold=8,
+        out_shift_right=True,
+        auto_push=True,
+        push_threshold=8,
+        in_shift_right=True,
+    )
+
+
+def _make_spi(clk, cmd, dat):
+    """Create and lock the SPI bus used only to talk to the controller"""
+    import busio  # pylint: disable=import-outside-toplevel
+
+    try:
+        spi = busio.SPI(clk, MOSI=cmd, MISO=dat)
+    except ValueError:  # pins aren't on an SPI peripheral, use native bit-bang
+        import bitbangio  # pylint: disable=import-outside-toplevel
+
+        spi = bitbangio.SPI(clk, MOSI=cmd, MISO=dat)
+    while not spi.try_lock():
+        pass
+    # PS2 is SPI mode 3, but LSB first, see _reverse_bits
+    spi.configure(baudrate=_SPI_BAUDRATE, polarity=1, phase=1)
+    return spi
+
+
+def _reverse_byte(x):
+    """Reverse the bit order of a byte by swapping nibbles, pairs, then bits"""
+    x = ((x & 0xF0) >> 4) | ((x & 0x0F) << 4)
+    x = ((x & 0xCC) >> 2) | ((x & 0x33) << 2)
+    return ((x & 0xAA) >> 1) | ((x & 0x55) << 1)
+
+
+# SPI peripherals are MSB first, PS2 is LSB first, so bytes are bit-reversed
+_reverse_bits = bytes(_reverse_byte(i) for i in range(256))
+
+
 PS2ButtonEvent = namedtuple("PS2ButtonEvent", ("id", "pressed", "released", "name"))
-""" The event 'objects' returned by ps2.update()"""
+""" The event 'objects' returned by ps2.update().
+They are plain tuples underneath, so unpacking them with
+``for button_id, pressed, released, name in events:`` is quickest"""
+
+
+# fmt: off
+# Kept at module level so hot paths skip the PS2Button attribute lookup
+_BUTTON_TO_ANALOG = (-1, -1, -1, -1, 11, 9, 12, 10, 19, 20, 17, 18, 13, 14, 15, 16)
+_BUTTON_BITS = tuple(1 << i for i in range(16))
+_BUTTON_NAMES = ("SELECT", "L3", "R3", "START", "UP", "RIGHT", "DOWN", "LEFT",
+                 "L2", "R2", "L1", "R1", "TRIANGLE", "CIRCLE", "CROSS", "SQUARE")
+# fmt: on
+# Same as _BUTTON_TO_ANALOG, but 0 (a header byte) for buttons without pressure
+_BUTTON_PRESSURE_INDEX = bytes(max(i, 0) for i in _BUTTON_TO_ANALOG)
 
 
 # pylint: disable-msg=(invalid-name, too-few-public-methods)
@@ -127,14 +222,20 @@ class PS2Button:
     SQUARE = 15
     """Square (pink) action button, digital and analog (pressure)"""
 
-    # fmt: off
     """Map digital button id to analog id (not all buttons are pressure)"""
-    button_to_analog_id = (-1, -1, -1, -1, 11, 9, 12, 10, 19, 20, 17, 18, 13, 14, 15, 16)
+    button_to_analog_id = _BUTTON_TO_ANALOG
 
     """Map digital button id to button name"""
-    names = ("SELECT", "L3", "R3", "START", "UP", "RIGHT", "DOWN", "LEFT",
-             "L2", "R2", "L1", "R1", "TRIANGLE", "CIRCLE", "CROSS", "SQUARE")
-    # fmt: on
+    names = _BUTTON_NAMES
+
+
+# Every possible event is immutable, so build them once instead of per update()
+_PRESSED_EVENTS = tuple(
+    PS2ButtonEvent(i, True, False, name) for i, name in enumerate(_BUTTON_NAMES)
+)
+_RELEASED_EVENTS = tuple(
+    PS2ButtonEvent(i, False, True, name) for i, name in enumerate(_BUTTON_NAMES)
+)
 
 
 class PS2Controller:  # pylint: disable=too-many-instance-attributes
@@ -149,7 +250,23 @@ class PS2Controller:  # pylint: disable=too-many-instance-attributes
                                  (otherwise faster digital only reads)
     :param bool enable_rumble: True to enable controlling rumble motors
                                  (needs extra voltage and current)
-    :param bool enable_pressue: True to enable reading analog button pressure
+    :param bool enable_pressure: True to enable reading analog button pressure
+    :param bool use_pio: True to shift data with an RP2040 PIO state machine
+                           instead of bit-banging (needs ``adafruit_pioasm``)
+    :param bool use_spi: True to shift data with a hardware SPI peripheral
+                           (or ``bitbangio`` if the pins have none) instead of
+                           bit-banging (dat needs an external pull-up resistor).
+                           Can't be combined with use_pio
+    :param int min_period_ms: update() calls closer together than this
+                                skip reading the controller (0 to always read)
+    :param bool measure_dt: True to time each read into ``last_dt`` (seconds),
+                              for debugging
+    :param int mode_switch_delay_ms: time to let the controller settle after
+                                       each config-mode command (at startup,
+                                       and when read() recovers a controller
+                                       stuck in config mode). Many controllers
+                                       are fine with much less than the
+                                       default, which speeds startup
 
     """
 
@@ -162,73 +279,176 @@ class PS2Controller:  # pylint: disable=too-many-instance-attributes
         enable_sticks=True,
         enable_rumble=False,
         enable_pressure=False,
-    ):  # pylint: disable=(too-many-arguments)
-        self.clk_pin = digitalio.DigitalInOut(clk)
+        use_pio=False,
+        use_spi=False,
+        min_period_ms=5,
+        measure_dt=False,
+        mode_switch_delay_ms=500,
+    ):  # pylint: disable=(too-many-arguments,too-many-statements)
+        if use_pio and use_spi:
+            raise ValueError("use_pio and use_spi are mutually exclusive")
         self.att_pin = digitalio.DigitalInOut(att)
-        self.cmd_pin = digitalio.DigitalInOut(cmd)
-        self.dat_pin = digitalio.DigitalInOut(dat)
-        self.clk_pin.switch_to_output(value=True)
         self.att_pin.switch_to_output(value=True)
-        self.cmd_pin.switch_to_output(value=True)
-        self.dat_pin.switch_to_input(pull=digitalio.Pull.UP)
+        # pick the transfer implementation once, instead of checking per transfer
+        self._sm = None
+        self._spi = None
+        if use_pio:
+            self._sm = _make_state_machine(clk, cmd, dat)
+            self._shift_inout_buf = self._sm.write_readinto
+            self._no_attention = self._no_attention_hw
+        elif use_spi:
+            self._spi = _make_spi(clk, cmd, dat)
+            self._spi_buf = memoryview(bytearray(_MAX_REPLY_LEN))
+            self._shift_inout_buf = self._shift_inout_buf_spi
+            self._no_attention = self._no_attention_hw
+        else:
+            self._shift_inout_buf = self._shift_inout_buf_bitbang
+            self._no_attention = self._no_attention_bitbang
+            self.clk_pin = digitalio.DigitalInOut(clk)
+            self.cmd_pin = digitalio.DigitalInOut(cmd)
+            self.dat_pin = digitalio.DigitalInOut(dat)
+            self.clk_pin.switch_to_output(value=True)
+            self.cmd_pin.switch_to_output(value=True)
+            self.dat_pin.switch_to_input(pull=digitalio.Pull.UP)
 
         self.enable_sticks = enable_sticks
         self.enable_rumble = enable_rumble
         self.enable_pressure = enable_pressure
 
-        self._last_dt = 0
+        self.measure_dt = measure_dt
+        self.last_dt = 0
         self._buttons = 0
         self._last_buttons = 0
-
-        self.motor1_level = 0  # 0-255, 40 is where motor starts moving
+        self._has_sticks = False
+        self._has_pressure = False
+        self._events = []  # reused by every update()
+
+        # preallocated so polling does not churn the heap
+        # whole poll frame, padding included, built once; with rumble on the
+        # motor level setters write bytes 3 & 4 straight into it, otherwise
+        # those stay 0x5A padding
+        self._poll_buf = bytearray(_poll + _pad[len(_poll) :])
+        self._poll_view = memoryview(self._poll_buf)
+        self._poll_len = len(_poll_rumble) if enable_rumble else len(_poll)
+        # reply buffers are only ever sliced, so keep them as views
+        self._in_buf = memoryview(bytearray(_MAX_REPLY_LEN))
+        self._config_buf = memoryview(bytearray(_MAX_REPLY_LEN))
+        self._out_buf = bytearray(_MAX_REPLY_LEN)
+        self._out_view = memoryview(self._out_buf)
+        self._reply_len = 0  # poll reply length, once known
+        # last reply, set by update(); a view into _in_buf, not a copy
+        self.data = self._in_buf[0:0]
+        self._mode_switch_delay = mode_switch_delay_ms / 1000
+        self._min_period_ns = min_period_ms * 1_000_000
+        self._last_update_ns = time.monotonic_ns() - self._min_period_ns
+
+        self._motor1_level = 0
+        self._motor2_level = 0
+        self.motor1_level = 0
         self.motor2_level = 0
 
-        if self._enter_config_mode():
-            self._enable_config_analog_sticks(enable_sticks)
-            self._enable_config_rumble(enable_rumble)
-            self._enable_config_analog_buttons(enable_pressure)
-            if not self._exit_config_mode():
-                print("PS2Controller: config exit error")
-        else:
-            print("PS2Controller: could not connect")
+        self._apply_config()
 
         self.update()  # to get initial button state
 
     def update(self):
-        """Read the controller and return a list of PS2ButtonEvents.
+        """Read the controller and return a list of PS2ButtonEvents,
+        an empty tuple if no buttons changed, or None on error (like disconnect).
+        The returned list is reused by the next update(), copy it to keep it.
+        Likewise ``data`` is a memoryview overwritten by the next read,
+        copy it with bytes() to keep or print it.
         Must be called frequently or the controller disconnects.
+        Calls made within min_period_ms of the last read return an empty tuple
+        without reading; data and buttons() keep their last values.
         """
-        start_t = time.monotonic()  # debugging
+        now_ns = time.monotonic_ns()
+        if now_ns - self._last_update_ns < self._min_period_ns:
+            return ()  # too soon, controller won't have anything new
+        return self._update(now_ns)
+
+    def _update(self, now_ns):
+        """Body of update() after the min_period_ms check"""
+        self._last_update_ns = now_ns
+
         self.data = self.read()
-        self.last_dt = time.monotonic() - start_t
+        # what the reply holds only changes here, so don't re-check per accessor
+        reply_len = len(self.data)
+        self._has_sticks = reply_len >= 9
+        self._has_pressure = reply_len >= 21
+        if self.measure_dt:  # debugging
+            self.last_dt = (time.monotonic_ns() - now_ns) / 1_000_000_000
 
         if not _is_valid_reply(self.data):
             return None  # None means error like disconnect
-        self._last_buttons = self._buttons
-        self._buttons = self.data[4] << 8 | self.data[3]
-        events = []
-        for i in range(16):
-            if self._last_buttons & (1 << i) != self._buttons & (1 << i):
-                pressed = (self._buttons & (1 << i)) == 0
-                released = not pressed
-                events.append(PS2ButtonEvent(i, pressed, released, PS2Button.names[i]))
+        self._last_buttons = last_buttons = self._buttons
+        self._buttons = buttons = struct.unpack_from("<H", self.data, 3)[0]
+        changed = last_buttons ^ buttons
+        if not changed:
+            return ()  # shared empty tuple, so nothing is allocated
+        events = self._events
+        events.clear()
+        # only visit the buttons that changed, lowest bit first
+        while changed:
+            bit = changed & -changed  # isolate lowest set bit
+            i = bit.bit_length() - 1
+            # buttons are active low
+            events.append(_RELEASED_EVENTS[i] if buttons & bit else _PRESSED_EVENTS[i])
+            changed ^= bit
         return events
 
+    async def update_async(self):
+        """Same as update(), but if called within min_period_ms of the last read,
+        waits out the rest of the period with asyncio.sleep() so other tasks
+        can run, instead of returning an empty tuple. Needs ``asyncio``.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        wait_ns = self._min_period_ns - (time.monotonic_ns() - self._last_update_ns)
+        if wait_ns > 0:
+            # asyncio.sleep() truncates to whole ms, so round up
+            await asyncio.sleep(-(-wait_ns // 1_000_000) / 1000)
+        else:
+            await asyncio.sleep(0)  # always yield, even with min_period_ms=0
+        # period is over, read without re-checking it
+        return self._update(time.monotonic_ns())
+
+    def poll_until_change(self, timeout_ms=None):
+        """Call update() until buttons change, sleeping between reads so
+        other code gets the CPU, and return those events. Returns an empty
+        tuple on timeout. Call update() directly if latency matters more.
+
+        :param int timeout_ms: give up after this many milliseconds,
+                                 or None to wait forever
+        """
+        if timeout_ms is not None:
+            deadline_ns = time.monotonic_ns() + timeout_ms * 1_000_000
+        while True:
+            events = self.update()
+            if events:
+                return events
+            if timeout_ms is not None and time.monotonic_ns() > deadline_ns:
+                return ()
+            time.sleep(_POLL_SLEEP_SECS)
+
     def read(self):
         """Read from the controller. Must be called frequently. Called by update()."""
+        poll_len = self._poll_len
         self._attention()
-        if self.enable_rumble:
-            pollr = list(_poll_rumble)
-            pollr[3] = self.motor1_level
-            pollr[4] = self.motor2_level
-            inbuf = self._autoshift(pollr)
+        if self._reply_len:  # controller mode is stable, skip probing reply length
+            frame_len = max(self._reply_len, poll_len)
+            inbuf = self._shift_frame(
+                self._poll_view[0:frame_len], self._in_buf, poll_len
+            )
         else:
-            inbuf = self._autoshift(_poll)
+            inbuf = self._autoshift(self._poll_view[0:poll_len], self._in_buf)
         self._no_attention()
 
+        self._reply_len = 0
         if _is_valid_reply(inbuf):
             if _is_config_reply(inbuf):
                 self._exit_config_mode()
+            else:
+                self._reply_len = _get_reply_length(inbuf) + 3
 
         return inbuf
 
@@ -245,159 +465,266 @@ class PS2Controller:  # pylint: disable=too-many-instance-attributes
 
         :param int button_id: 0-15 id number from PS2ButtonEvent.id or PS2Button.*
         """
-        return (self._buttons & (1 << button_id)) == 0
+        return (self._buttons & _BUTTON_BITS[button_id]) == 0
 
     def analog_button(self, button_id):
         """Return analog pressure (0-255) value for button,
-        if in pressure mode, otherwise -1.
+        if in pressure mode and button has pressure, otherwise -1.
 
         :param int button_id 0-15 id number PS2ButtonEvent.id or PS2Button.*
         """
-        if len(self.data) < 21:
+        index = _BUTTON_PRESSURE_INDEX[button_id]
+        if not index or not self._has_pressure:
             return -1
-        return self.data[PS2Button.button_to_analog_id[button_id]]
+        return self.data[index]
 
     def analog_right(self):
         """Return (x,y) tuple (0-255,0-255) of the right analog stick, if present."""
-        if len(self.data) < 6:
+        if not self._has_sticks:
             return (-1, -1)
         return (self.data[5], self.data[6])
 
     def analog_left(self):
         """Return (x,y) tuple (0-255,0-255) of the left analog stick, if present."""
-        if len(self.data) < 6:
+        if not self._has_sticks:
             return (-1, -1)
         return (self.data[7], self.data[8])
 
+    @property
+    def motor1_level(self):
+        """Rumble motor 1 level (0-255, 40 is where motor starts moving),
+        sent on every read if enable_rumble"""
+        return self._motor1_level
+
+    @motor1_level.setter
+    def motor1_level(self, level):
+        self._motor1_level = level
+        if self.enable_rumble:
+            self._poll_buf[3] = level
+
+    @property
+    def motor2_level(self):
+        """Rumble motor 2 level (0-255), sent on every read if enable_rumble"""
+        return self._motor2_level
+
+    @motor2_level.setter
+    def motor2_level(self, level):
+        self._motor2_level = level
+        if self.enable_rumble:
+            self._poll_buf[4] = level
+
     def _attention(self):
         """Select joystick for reading/writing"""
         self.att_pin.value = False  # active low CS pin
         _delay_micros(_ATTN_DELAY_MICROS)
 
-    def _no_attention(self):
-        """Deselect joystick for reading/writing"""
-        self.cmd_pin.value = True
-        self.clk_pin.value = True  # idle state
+    def _no_attention_bitbang(self):
+        """Deselect joystick for reading/writing, idling the bit-banged cmd pin"""
+        self.cmd_pin.value = True  # idle state
+        # clk needs no write, every bit-banged bit already ends with it high
+        self.att_pin.value = True
+        # no delay here, the next _attention() waits before clocking anyway
+
+    def _no_attention_hw(self):
+        """Deselect joystick for reading/writing, PIO/SPI idle their own pins"""
         self.att_pin.value = True
-        _delay_micros(_ATTN_DELAY_MICROS)
 
     def _shift_inout_byte(self, byte_out):
         """Bit-bang out a single byte on cmd_pin, while reading in a single byte on dat_pin"""
+        # no direct register access in CircuitPython, so keep the per-bit work
+        # down to the pin writes themselves: pins as locals, precomputed masks
+        cmd_pin = self.cmd_pin
+        clk_pin = self.clk_pin
+        dat_pin = self.dat_pin
         byte_in = 0
+        cmd_value = None  # unknown, so the first bit is always written
         # clock is held high until a byte is to be sent
-        for i in range(8):
-            self.cmd_pin.value = (byte_out & (1 << i)) != 0  # send OUT data on cmd pin
-            self.clk_pin.value = False  # clock LOW
-            _delay_micros(_HOLD_TIME_MICROS)
-            if self.dat_pin.value:  # read IN data on dat pin
-                byte_in |= 1 << i
-            self.clk_pin.value = True  # clock HIGH
-            _delay_micros(_HOLD_TIME_MICROS)
+        # no explicit hold time: each pin write already takes longer than
+        # the ~2 usec the controller needs for dat/cmd to settle around clk
+        for mask in _BITS:
+            bit = (byte_out & mask) != 0
+            if bit != cmd_value:  # only touch cmd pin when the bit changes
+                cmd_pin.value = cmd_value = bit  # send OUT data on cmd pin
+            clk_pin.value = False  # clock LOW
+            if dat_pin.value:  # read IN data on dat pin
+                byte_in |= mask
+            clk_pin.value = True  # clock HIGH
         return byte_in
 
-    def _shift_inout_buf(self, bytes_out):
+    def _shift_inout_buf_bitbang(self, bytes_out, bytes_in):
         """
         Send out a buffer of bytes on cmd_pin,
-        while reading in a same-sized buffer on dat_pin
+        while reading into a same-sized buffer from dat_pin.
+        Used as _shift_inout_buf() unless PIO or SPI was chosen
         """
-        inbuf = [0] * len(bytes_out)
+        # no delay between bytes needed, the loop overhead is longer than
+        # the couple of usec the controller wants
+        shift_inout_byte = self._shift_inout_byte
         for i, bout in enumerate(bytes_out):
-            inbuf[i] = self._shift_inout_byte(bout)
-            _delay_micros(_BYTE_DELAY_MICROS)
-        return inbuf
+            bytes_in[i] = shift_inout_byte(bout)
+
+    def _shift_inout_buf_spi(self, bytes_out, bytes_in):
+        """Same as _shift_inout_buf_bitbang(), but via hardware SPI"""
+        reverse_bits = _reverse_bits
+        txbuf = self._spi_buf[0 : len(bytes_out)]
+        for i, bout in enumerate(bytes_out):
+            txbuf[i] = reverse_bits[bout]
+        self._spi.write_readinto(txbuf, bytes_in)
+        for i, bin_ in enumerate(bytes_in):
+            bytes_in[i] = reverse_bits[bin_]
 
-    def _autoshift(self, cmd_out):
+    def _autoshift(self, cmd_out, inbuf):
         """
         Send out a command buffer to the controller,
-        while also reading in a variable-length response buffer
-        Returns the exact size buffer returned by the controller,
+        while also reading in a variable-length response into inbuf (a memoryview)
+        Returns a memoryview of the exact size buffer returned by the controller,
         or the invalid '0xff' 3-byte initial read buffer
         """
         cmdlen = len(cmd_out)
         if cmdlen < 3:
             return None  # wat
+        cmd_out = memoryview(cmd_out)
 
-        # all commands have at least 3 bytes, so shift those out first
-        inbufA = self._shift_inout_buf(cmd_out[0:3])
-
-        if _is_valid_reply(inbufA):
-            reply_len = _get_reply_length(inbufA)
-            # print("\t\t\t\tvalid len:", reply_len, "iscfg:",_is_config_reply(inbufA))
-            inbufB = []  # hack
-            if cmdlen > 3:  # shift out rest of command
-                inbufB = self._shift_inout_buf(cmd_out[3:])
+        # all commands have at least 3 bytes, so shift those out first.
+        # caller keeps att low across both transfers, so the controller sees
+        # one continuous frame and there's no re-select delay in between
+        self._shift_inout_buf(cmd_out[0:3], inbuf[0:3])
 
-            num_left = reply_len - cmdlen + 3
-            # print("\t\t numleft:",num_left)
-            if num_left == 0:
-                return inbufA + inbufB
+        if _is_valid_reply(inbuf):
+            reply_len = _get_reply_length(inbuf)
+            # print("\t\t\t\tvalid len:", reply_len, "iscfg:",_is_config_reply(inbuf))
+            # shift out rest of command, padded to the reply length, in one go
+            end = max(cmdlen, reply_len + 3)
+            outbuf = self._out_buf
+            outbuf[3:cmdlen] = cmd_out[3:]
+            outbuf[cmdlen:end] = _pad[cmdlen:end]
+            if end > 3:
+                self._shift_inout_buf(self._out_view[3:end], inbuf[3:end])
+            return inbuf[0:end]
+
+        return inbuf[0:3]  # on error
+
+    def _shift_fixed(self, cmd_out, inbuf, total_len):
+        """
+        Like _autoshift(), but for when the reply length is already known,
+        so the whole padded command goes out in a single transfer.
+        Returns a memoryview of the reply, or of the 3-byte header if invalid
+        """
+        cmdlen = len(cmd_out)
+        outbuf = self._out_buf
+        outbuf[0:cmdlen] = cmd_out
+        outbuf[cmdlen:total_len] = _pad[cmdlen:total_len]
+        return self._shift_frame(self._out_view[0:total_len], inbuf, cmdlen)
 
-            # else pad output to get remaining input
-            inbufC = self._shift_inout_buf([0x5A] * num_left)
-            return inbufA + inbufB + inbufC
+    def _shift_frame(self, frame, inbuf, cmdlen):
+        """
+        Shift out a whole command frame (cmdlen bytes of command, then padding)
+        in a single transfer.
+        Returns a memoryview of the reply, or of the 3-byte header if invalid
+        """
+        total_len = len(frame)
+        self._shift_inout_buf(frame, inbuf[0:total_len])
 
-        return inbufA  # on error
+        if _is_valid_reply(inbuf):
+            # reply may be shorter if controller changed modes
+            reply_len = max(cmdlen, _get_reply_length(inbuf) + 3)
+            return inbuf[0 : min(reply_len, total_len)]
+        return inbuf[0:3]  # on error
+
+    def _apply_config(self):
+        """Set the controller to the stick/rumble/pressure modes asked for.
+        Only called from __init__, before the first poll.
+        Returns True if the controller accepted the config commands"""
+        if not self._enter_config_mode():
+            print("PS2Controller: could not connect")
+            return False
+        self._enable_config_analog_sticks(self.enable_sticks)
+        self._enable_config_rumble(self.enable_rumble)
+        self._enable_config_analog_buttons(self.enable_pressure)
+        if not self._exit_config_mode():
+            print("PS2Controller: config exit error")
+            return False
+        return True
 
     def _enter_config_mode(self):
         """Enter config mode to enable changing analog/digital/pressure modes"""
-        return self._change_config_mode(_enter_config)
+        # only sent before the first poll, so the reply length isn't known yet
+        return self._change_config_mode(_enter_config, 0)
 
     def _exit_config_mode(self):
         """Exit config mode to go back to regular polling mode"""
-        return self._change_config_mode(_exit_config)
+        return self._change_config_mode(_exit_config, _CONFIG_REPLY_LEN)
 
-    def _change_config_mode(self, outbuf):
-        start_t = time.monotonic()
-        while (time.monotonic() - start_t) < _COMMAND_TIMEOUT_SECS:
+    def _change_config_mode(self, outbuf, reply_len):
+        """
+        Send a config mode enter/exit command until the controller takes it.
+        If reply_len is known (non-zero) each try is a single transfer
+        """
+        monotonic = time.monotonic
+        is_valid_reply = _is_valid_reply
+        is_config_reply = _is_config_reply
+        deadline = monotonic() + _COMMAND_TIMEOUT_SECS
+        while monotonic() < deadline:
             self._attention()
-            inbuf = self._autoshift(outbuf)
+            if reply_len:
+                inbuf = self._shift_fixed(outbuf, self._config_buf, reply_len)
+            else:
+                inbuf = self._autoshift(outbuf, self._config_buf)
             self._no_attention()
 
-            if _is_valid_reply(inbuf) and _is_config_reply(inbuf):
-                time.sleep(_MODE_SWITCH_DELAY_SECS)
+            if is_valid_reply(inbuf) and is_config_reply(inbuf):
+                time.sleep(self._mode_switch_delay)
                 return True
         # print("PS2Controller: change_config_mode timeout!!!")
         return False
 
-    def _try_enable_mode(self, outbuf):
+    def _try_enable_mode(self, cmd_out, settings):
         """
-        Attempt to enable a controller mode. Returns True if no timeout.
+        Attempt to enable a controller mode, sending cmd_out with the bytes
+        from 3 on replaced by settings. Returns True if no timeout.
         If controller does not support mode, this function does NOT verify it
         """
+        # already in config mode, so reply length is known: build the frame
+        # once in this instance's scratch buffer, one transfer per try
+        cmdlen = len(cmd_out)
+        outbuf = self._out_buf
+        outbuf[0:cmdlen] = cmd_out
+        outbuf[3 : 3 + len(settings)] = bytes(settings)
+        outbuf[cmdlen:_CONFIG_REPLY_LEN] = _pad[cmdlen:_CONFIG_REPLY_LEN]
+        frame = self._out_view[0:_CONFIG_REPLY_LEN]
         good_reply_count = 0
-        start_t = time.monotonic()
-        while (time.monotonic() - start_t) < _COMMAND_TIMEOUT_SECS:
+        monotonic = time.monotonic
+        is_valid_reply = _is_valid_reply
+        is_config_reply = _is_config_reply
+        deadline = monotonic() + _COMMAND_TIMEOUT_SECS
+        while monotonic() < deadline:
             self._attention()
-            inbuf = self._autoshift(outbuf)
+            inbuf = self._shift_frame(frame, self._config_buf, cmdlen)
             self._no_attention()
 
             # "We can't know if we have successfully enabled analog mode until
             # we get out of config mode, so let's just be happy if we get a few
             # consecutive valid replies"
-            if inbuf is not None:
+            if is_valid_reply(inbuf) and is_config_reply(inbuf):
                 good_reply_count += 1
                 if good_reply_count == 3:
-                    time.sleep(_MODE_SWITCH_DELAY_SECS)
+                    time.sleep(self._mode_switch_delay)
                     return True
+            else:
+                good_reply_count = 0
         return False
 
     def _enable_config_analog_sticks(self, enable=True, locked=True):
         """Attempt to enable analog joysticks"""
-        outbuf = list(_set_mode)
-        outbuf[3] = 1 * enable
-        outbuf[4] = 1 * locked
-        return self._try_enable_mode(outbuf)
+        return self._try_enable_mode(_set_mode, (1 * enable, 1 * locked))
 
     def _enable_config_rumble(self, enable=True):
         """Attempt to enable rumble motors"""
-        outbuf = list(_enable_rumble)
-        outbuf[3] = 0xFF * enable  # convert True/False to 0xFF/0x00
-        outbuf[4] = 0xFF * enable
-        return self._try_enable_mode(outbuf)
+        level = 0xFF * enable  # convert True/False to 0xFF/0x00
+        return self._try_enable_mode(_enable_rumble, (level, level))
 
     def _enable_config_analog_buttons(self, enable=True):
         """Attempt to enable analog (pressure) buttons"""
-        outbuf = list(_set_pressures)
-        if not enable:
-            outbuf[3:5] = (0, 0, 0)
-        return self._try_enable_mode(outbuf)
+        return self._try_enable_mode(
+            _set_pressures, (0xFF * enable, 0xFF * enable, 0x03 * enable)
+        )